@@ -6,9 +6,9 @@ FastAPI-based shared functionality for all Denser Agent types
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from pydantic import BaseModel
-import json
+import orjson
 import os
 import time
 import uvicorn
@@ -17,6 +17,16 @@ from abc import ABC, abstractmethod
 
 from tools.mcp_tools_manager import mcp_manager
 
+# Use uvloop + httptools when installed for a faster event loop and HTTP parser
+try:
+    import uvloop  # noqa: F401
+    import httptools  # noqa: F401
+    UVICORN_LOOP = "uvloop"
+    UVICORN_HTTP = "httptools"
+except ImportError:
+    UVICORN_LOOP = "auto"
+    UVICORN_HTTP = "auto"
+
 
 # Pydantic models
 class ChatRequest(BaseModel):
@@ -37,29 +47,64 @@ class ConfigResponse(BaseModel):
 class BaseAgentApp(ABC):
     """Simplified FastAPI app for agents"""
 
+    # Class-level cache of parsed config files keyed by absolute path,
+    # so repeated app instantiations skip the disk read + JSON parse
+    _config_cache: Dict[str, Dict[str, Any]] = {}
+
     def __init__(self, agent_type: str, agent_dir: str):
         self.agent_type = agent_type
         self.agent_dir = agent_dir
         self.config = self._load_config()
-        self.app = FastAPI(title=f"{agent_type.title()} Agent", version="1.0.0")
+        self.app = FastAPI(title=f"{agent_type.title()} Agent", version="1.0.0",
+                           default_response_class=ORJSONResponse)
 
-        # Add CORS middleware
+        # Add CORS middleware with explicit lists and a long preflight
+        # max_age so browsers don't re-issue OPTIONS on every request
         self.app.add_middleware(
             CORSMiddleware,
             allow_origins=["*"],
             allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
+            allow_methods=["GET", "POST", "OPTIONS"],
+            allow_headers=["content-type", "authorization"],
+            max_age=86400,
+        )
+
+        # Cache the shared chatbot page in memory; serving it is then a
+        # zero-syscall response instead of a stat + read per page load
+        self._chatbot_path = os.path.join(os.path.dirname(self.agent_dir), 'chatbot.html')
+        try:
+            with open(self._chatbot_path, 'rb') as f:
+                self._chatbot_bytes = f.read()
+        except OSError:
+            self._chatbot_bytes = None
+
+        # UI config never changes per process - build the response once
+        self._config_response = ConfigResponse(
+            agent_name=self.config.get('agent_name', f"{self.agent_type.title()} Assistant"),
+            agent_type=self.agent_type,
+            agent_emoji=self.get_agent_emoji(),
+            agent_description=self.get_agent_description(),
+            primary_color=self.get_primary_color(),
+            background_gradient=self.get_background_gradient(),
+            initial_message=self.get_initial_message(),
+            input_placeholder=self.get_input_placeholder()
         )
 
         self.setup_routes()
 
     def _load_config(self) -> Dict[str, Any]:
-        """Load agent configuration"""
+        """Load agent configuration (cached per config path)"""
         try:
-            config_path = os.path.join(self.agent_dir, 'config.json')
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            config_path = os.path.abspath(os.path.join(self.agent_dir, 'config.json'))
+            cached = BaseAgentApp._config_cache.get(config_path)
+            if cached is not None:
+                return cached
+
+            with open(config_path, 'rb') as f:
+                config = orjson.loads(f.read())
+
+            BaseAgentApp._config_cache[config_path] = config
+            return config
         except Exception as e:
             print(f"❌ Failed to load config: {e}")
             return {}
@@ -70,26 +115,18 @@ class BaseAgentApp(ABC):
         @self.app.get("/")
         async def serve_index():
             """Serve the shared chatbot HTML file"""
-            agents_dir = os.path.dirname(self.agent_dir)
-            chatbot_path = os.path.join(agents_dir, 'chatbot.html')
-            return FileResponse(chatbot_path)
+            if self._chatbot_bytes is not None:
+                return Response(
+                    content=self._chatbot_bytes,
+                    media_type='text/html',
+                    headers={'Cache-Control': 'public, max-age=300'}
+                )
+            return FileResponse(self._chatbot_path)
 
         @self.app.get("/api/config", response_model=ConfigResponse)
         async def get_config():
             """Get agent configuration for UI customization"""
-            try:
-                return ConfigResponse(
-                    agent_name=self.config.get('agent_name', f"{self.agent_type.title()} Assistant"),
-                    agent_type=self.agent_type,
-                    agent_emoji=self.get_agent_emoji(),
-                    agent_description=self.get_agent_description(),
-                    primary_color=self.get_primary_color(),
-                    background_gradient=self.get_background_gradient(),
-                    initial_message=self.get_initial_message(),
-                    input_placeholder=self.get_input_placeholder()
-                )
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            return self._config_response
 
         @self.app.post("/api/chat")
         async def chat_endpoint(request: ChatRequest):
@@ -177,9 +214,37 @@ class BaseAgentApp(ABC):
         }
         return placeholders.get(self.agent_type, 'Ask me anything...')
 
-    def run(self, host='0.0.0.0', port=4000, reload=True):
-        """Run the FastAPI app with uvicorn"""
-        uvicorn.run(self.app, host=host, port=port, reload=reload)
+    def run(self, host='0.0.0.0', port=4000, reload=False, app_import_string=None):
+        """Run the FastAPI app with uvicorn
+
+        uvicorn only supports real auto-reload with an import string
+        target, so reload=True requires app_import_string (e.g.
+        "agents.customer_support.app:app"). Passing an app instance with
+        reload enabled just spins up reloader machinery for nothing.
+        """
+        if reload:
+            if not app_import_string:
+                raise ValueError("reload=True requires app_import_string")
+            uvicorn.run(app_import_string, host=host, port=port, reload=True,
+                        loop=UVICORN_LOOP, http=UVICORN_HTTP, access_log=False)
+        else:
+            uvicorn.run(self.app, host=host, port=port,
+                        loop=UVICORN_LOOP, http=UVICORN_HTTP, access_log=False)
+
+    def run_production(self, app_import_string, host='0.0.0.0', port=4000, workers=None):
+        """Run under gunicorn with uvicorn workers for multi-core throughput
+
+        app_import_string must be importable by gunicorn, e.g.
+        "agents.customer_support.app:create_app()". Keep run() for dev.
+        """
+        workers = workers or (2 * (os.cpu_count() or 1) + 1)
+        os.execvp('gunicorn', [
+            'gunicorn',
+            '-k', 'uvicorn.workers.UvicornWorker',
+            '-w', str(workers),
+            '-b', f'{host}:{port}',
+            app_import_string,
+        ])
 
 
 # MCP tool helper functions
@@ -4,6 +4,15 @@ Chart Generation Utility
 Extracts chart generation logic from agents for reusability
 """
 
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Precompiled patterns for markdown table rows and numeric cells
+_ROW_RE = re.compile(r'^\|(.+)\|$')
+_NUM_RE = re.compile(r'^-?\d+(\.\d+)?$')
+
 
 def generate_chart_data(tool_result: str, operation_detail: str = None) -> dict:
     """Generate chart data from SQL query results if suitable"""
@@ -12,45 +21,45 @@ def generate_chart_data(tool_result: str, operation_detail: str = None) -> dict:
         if not isinstance(tool_result, str) or len(tool_result.strip()) < 10:
             return None
 
-        lines = [line for line in tool_result.strip().split('\n') if line.strip() and "|" in line]
-        if len(lines) < 3:  # Need header + separator + at least 1 data row
+        # Fast path: no pipe near the top means no markdown table,
+        # skip the line scan entirely
+        if '|' not in tool_result.lstrip()[:512]:
             return None
 
-        # Look for table-like structure (with | separators)
-        if '|' not in lines[0] or '|' not in lines[1]:
-            return None
+        # Single pass over the lines: collect header + data rows and
+        # count numeric cells per column as we go
+        headers = None
+        rows = []
+        numeric_counts = []
+        for line in tool_result.splitlines():
+            match = _ROW_RE.match(line.strip())
+            if not match:
+                continue
 
-        # Parse header
-        header_line = lines[0].strip()
-        if not header_line.startswith('|') or not header_line.endswith('|'):
-            return None
+            cells = [cell.strip() for cell in match.group(1).split('|')]
 
-        headers = [h.strip() for h in header_line.split('|')[1:-1]]
+            if headers is None:
+                headers = cells
+                numeric_counts = [0] * len(cells)
+                continue
 
-        # Skip separator line and parse data
-        data_lines = lines[2:]
-        rows = []
-        for line in data_lines:
-            line = line.strip()
-            if line.startswith('|') and line.endswith('|'):
-                row = [cell.strip() for cell in line.split('|')[1:-1]]
-                if len(row) == len(headers):
-                    rows.append(row)
-
-        if len(rows) == 0 or len(headers) < 2:
-            return None
+            # Skip the markdown separator row (|---|---|)
+            if all(cell and not cell.strip('-') for cell in cells):
+                continue
 
-        # Check if we have numeric data suitable for charts
-        numeric_columns = []
-        for i, header in enumerate(headers):
-            try:
-                # Check if all values in this column are numeric
-                values = [float(row[i]) for row in rows if row[i].replace('.', '').replace('-', '').isdigit()]
-                if len(values) == len(rows):  # All values are numeric
-                    numeric_columns.append(i)
-            except:
+            if len(cells) != len(headers):
                 continue
 
+            for i, cell in enumerate(cells):
+                if _NUM_RE.match(cell):
+                    numeric_counts[i] += 1
+            rows.append(cells)
+
+        if headers is None or len(rows) == 0 or len(headers) < 2:
+            return None
+
+        # Columns where every value matched the numeric pattern
+        numeric_columns = [i for i, count in enumerate(numeric_counts) if count == len(rows)]
         if len(numeric_columns) == 0:
             return None
 
@@ -91,9 +100,10 @@ def generate_chart_data(tool_result: str, operation_detail: str = None) -> dict:
             }
         }
 
-        print(f"Generated {chart_type} chart with {len(labels)} data points")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated %s chart with %d data points", chart_type, len(labels))
         return chart_data
 
     except Exception as e:
-        print(f"Chart generation failed: {e}")
+        logger.error(f"Chart generation failed: {e}")
         return None
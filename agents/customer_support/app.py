@@ -4,35 +4,70 @@ Simplified Customer Support Agent
 FastAPI-based customer support chatbot with database and tool capabilities
 """
 
+import asyncio
+import logging
 import os
+import re
+import time
 from typing import Dict, Any
 
+from anthropic import AsyncAnthropic
+
 # Package imports (no sys.path needed after installation)
 from agents.base_agent import BaseAgentApp, call_mcp_tool, get_mcp_tools
 from agents.chart_utils import generate_chart_data
 from tools.mcp_tools_manager import mcp_manager
 
+logger = logging.getLogger(__name__)
+
+
+# Matches numbered list entries like "1. **customers**" from list_tables output
+_TABLE_RE = re.compile(r'^\s*\d+\.\s+\*\*([^*]+)\*\*', re.MULTILINE)
+
 
 def extract_table_names_simple(text):
-    lines = text.split('\n')
-    tables = []
-    for line in lines:
-        if '**' in line and any(char.isdigit() for char in line):
-            # Extract text between ** markers
-            start = line.find('**') + 2
-            end = line.rfind('**')
-            if start < end:
-                tables.append(line[start:end])
-    return tables
+    return _TABLE_RE.findall(text)
 
 class CustomerSupportAgentApp(BaseAgentApp):
     """Simplified Customer Support agent application"""
 
+    # Class-level schema cache keyed by agent type, so re-created app
+    # objects in the same process reuse already-discovered schemas
+    _schema_cache: Dict[str, Dict[str, Any]] = {}
+
+    # How long the discovered tools + system prompt stay fresh (seconds)
+    TOOLS_CACHE_TTL = 60
+
+    # Minimum interval between tool-discovery RPC fanouts (seconds)
+    DISCOVER_TTL = 30
+
     def __init__(self):
         agent_dir = os.path.dirname(os.path.abspath(__file__))
         super().__init__("customer_support", agent_dir)
-        self.table_schemas = {}
-        self.schemas_cached = False
+        self.table_schemas = CustomerSupportAgentApp._schema_cache.setdefault(self.agent_type, {})
+        self.schemas_cached = bool(self.table_schemas)
+        self._tools_cache = None
+        self._tools_cache_ts = 0.0
+        self._system_prompt = None
+        self._anthropic = None
+        self._last_discover_ts = 0.0
+
+    def _client(self) -> AsyncAnthropic:
+        """Get the shared Claude client, creating it on first use.
+
+        Reusing one client keeps the underlying httpx connection pool
+        (and its TLS sessions) alive across requests.
+        """
+        if self._anthropic is None:
+            self._anthropic = AsyncAnthropic(api_key=os.getenv('CLAUDE_API_KEY'))
+        return self._anthropic
+
+    async def _discover_tools_cached(self):
+        """Run mcp_manager.discover_tools at most once per DISCOVER_TTL window"""
+        if time.time() - self._last_discover_ts < self.DISCOVER_TTL:
+            return
+        await mcp_manager.discover_tools()
+        self._last_discover_ts = time.time()
 
     async def _get_table_schemas(self):
         """Get and cache table schemas"""
@@ -40,27 +75,69 @@ class CustomerSupportAgentApp(BaseAgentApp):
             return self.table_schemas
 
         try:
-            await mcp_manager.discover_tools()
+            await self._discover_tools_cached()
             tables_result = await call_mcp_tool('list_tables', {})
             # '## 📋 Database Tables\n\n1. **customers**\n2. **orders**\n3. **products**\n'
             tables = extract_table_names_simple(tables_result)
-            for table in tables:
-                try:
-                    schema = await call_mcp_tool('describe_table', {'table_name': table})
-                    if schema:
-                        self.table_schemas[table] = schema
-                except Exception:
+            # Describe all tables concurrently - the RPCs are independent
+            results = await asyncio.gather(
+                *(call_mcp_tool('describe_table', {'table_name': table}) for table in tables),
+                return_exceptions=True
+            )
+            for table, schema in zip(tables, results):
+                if isinstance(schema, Exception) or not schema:
                     continue
+                self.table_schemas[table] = schema
 
             self.schemas_cached = True
             return self.table_schemas
 
         except Exception as e:
-            print(f"❌ Schema initialization failed: {e}")
+            logger.error(f"❌ Schema initialization failed: {e}")
             return {}
 
+    async def _get_tools_and_prompt(self):
+        """Get Claude-formatted tools and the system prompt, cached with a TTL"""
+        if self._tools_cache is not None and self._system_prompt is not None \
+                and time.time() - self._tools_cache_ts < self.TOOLS_CACHE_TTL:
+            return self._tools_cache, self._system_prompt
+
+        # Get available tools (discovers from MCP servers internally)
+        available_tools = await get_mcp_tools()
+
+        # Build system prompt
+        tool_names = [t['name'] for t in available_tools]
+        # Build comprehensive system prompt with all tool context
+        schema_context = ""
+        if self.table_schemas:
+            parts = ["\n\nDatabase Schema:\n"]
+            parts.extend(f"\nTable: {table_name}\n{schema}\n"
+                         for table_name, schema in self.table_schemas.items())
+            schema_context = "".join(parts)
+
+        system_prompt = f"""You are a customer support assistant with access to tools. ALWAYS use the appropriate tool for user requests.
+
+Available tools: {tool_names}{schema_context}
+
+IMPORTANT:
+- For weather questions (current weather, forecasts, alerts) → use get_current_weather, get_weather_forecast, or get_weather_alerts
+- For database queries (customer data, analytics, reports) → use execute_query, describe_table, list_tables, or get_table_data
+- For meeting requests → use schedule_meeting
+
+When a user asks about weather, database data, or meetings, you MUST call the appropriate tool. Do not just explain what you would do - actually use the tools."""
+
+        # get_mcp_tools already returns Claude-shaped dicts
+        # (name/description/input_schema) - no per-request copy needed
+        claude_tools = available_tools
+
+        self._tools_cache = claude_tools
+        self._system_prompt = system_prompt
+        self._tools_cache_ts = time.time()
+        return claude_tools, system_prompt
+
     async def handle_chat_with_tools(self, messages) -> Dict[str, Any]:
         """Simplified LLM chat handling with tool calling"""
+        tool_task = None
         try:
             # Get table schemas and limit messages
             await self._get_table_schemas()
@@ -70,87 +147,58 @@ class CustomerSupportAgentApp(BaseAgentApp):
             if len(messages) > max_turns:
                 messages = messages[-max_turns:]
 
-            # Initialize Claude client
-            from anthropic import Anthropic
+            # Reuse the shared Claude client across requests
             api_key = os.getenv('CLAUDE_API_KEY')
             if not api_key:
                 return {'success': False, 'message': 'Claude API key not configured'}
 
-            client = Anthropic(api_key=api_key)
-
-            # Get available tools
-            await mcp_manager.discover_tools()
-            available_tools = await get_mcp_tools()
-
-            # Build system prompt
-            tool_names = [t['name'] for t in available_tools]
-            # Build comprehensive system prompt with all tool context
-            schema_context = ""
-            if self.table_schemas:
-                schema_context = "\n\nDatabase Schema:\n"
-                for table_name, schema in self.table_schemas.items():
-                    schema_context += f"\nTable: {table_name}\n{schema}\n"
-
-            # schema_info = "\n".join([f"Table: {name}" for name in self.table_schemas.keys()]) if self.table_schemas else ""
-
-            system_prompt = f"""You are a customer support assistant with access to tools. ALWAYS use the appropriate tool for user requests.
-
-Available tools: {tool_names}{schema_context}
-
-IMPORTANT: 
-- For weather questions (current weather, forecasts, alerts) → use get_current_weather, get_weather_forecast, or get_weather_alerts
-- For database queries (customer data, analytics, reports) → use execute_query, describe_table, list_tables, or get_table_data  
-- For meeting requests → use schedule_meeting
-
-When a user asks about weather, database data, or meetings, you MUST call the appropriate tool. Do not just explain what you would do - actually use the tools."""
+            client = self._client()
 
-            # Prepare tools for Claude
-            claude_tools = []
-            for tool in available_tools:
-                claude_tools.append({
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "input_schema": tool["input_schema"]
-                })
+            # Get tools and system prompt (cached between requests)
+            claude_tools, system_prompt = await self._get_tools_and_prompt()
 
-            print(f"🔧 Available tools: {[t['name'] for t in claude_tools]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔧 Available tools: %s", [t['name'] for t in claude_tools])
 
-            # Call LLM with tools
+            # Call LLM with tools, streaming so a tool call can start
+            # executing while the rest of the response is still decoding
             llm_config = self.config.get('components', {}).get('llm', {})
-            response = client.messages.create(
+            tool_use_content = None
+            async with client.messages.stream(
                 model=llm_config.get('model', 'claude-3-5-haiku-latest'),
                 max_tokens=llm_config.get('max_tokens', 1000),
                 system=system_prompt,
                 messages=messages,
                 tools=claude_tools
-            )
-
-            # Debug: Show what Claude responded with
-            print(f"🔍 Claude response content types: {[c.type for c in response.content]}")
-            for i, content in enumerate(response.content):
-                print(f"🔍 Content {i}: type={content.type}")
-                if hasattr(content, 'text'):
-                    print(f"🔍 Text: {content.text[:100]}...")
-                if hasattr(content, 'name'):
-                    print(f"🔍 Tool: {content.name}")
+            ) as stream:
+                async for event in stream:
+                    # Kick off the MCP call as soon as a tool_use block completes
+                    if (event.type == "content_block_stop"
+                            and event.content_block.type == "tool_use"
+                            and tool_use_content is None):
+                        tool_use_content = event.content_block
+                        tool_task = asyncio.create_task(
+                            call_mcp_tool(tool_use_content.name, tool_use_content.input)
+                        )
+
+                response = await stream.get_final_message()
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔍 Claude response content types: %s", [c.type for c in response.content])
 
             # Handle tool use or text response - prioritize tool_use
-            tool_use_content = None
             text_content = None
-
             for content in response.content:
-                if content.type == "tool_use":
-                    tool_use_content = content
-                elif content.type == "text":
+                if content.type == "text":
                     text_content = content
 
             # Process tool_use first if present
             if tool_use_content:
-                print(f"🛠️ Calling tool: {tool_use_content.name}")
                 # Decide whether to use tool, and how to use tool, ie, parameters
-                print(f"Tool Name: {tool_use_content.name}")
-                print(f"Tool Input: {tool_use_content.input}")
-                tool_result = await call_mcp_tool(tool_use_content.name, tool_use_content.input)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🛠️ Calling tool: %s with input: %s",
+                                 tool_use_content.name, tool_use_content.input)
+                tool_result = await tool_task
                 if tool_result:
                     # Create reasoning step
                     tool_type = 'Database' if tool_use_content.name.startswith(
@@ -179,15 +227,31 @@ When a user asks about weather, database data, or meetings, you MUST call the ap
 
             # Fall back to text if no tool_use
             elif text_content:
-                print(f"📝 Claude returned text response: {text_content.text[:100]}...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📝 Claude returned text response: %s...", text_content.text[:100])
                 return {'success': True, 'message': text_content.text}
 
             return {'success': True,
                     'message': 'Hello! I can help with database queries, weather, and meeting scheduling.'}
 
         except Exception as e:
-            print(f"❌ Chat error: {e}")
+            logger.error(f"❌ Chat error: {e}")
             return {'success': False, 'message': 'Sorry, I encountered an error. Please try again.'}
+        finally:
+            # If the stream failed after a tool_use block launched its
+            # MCP call, don't let that call (possibly a mutating query)
+            # keep running while the user sees the error fallback
+            if tool_task is not None and not tool_task.done():
+                tool_task.cancel()
+                try:
+                    await tool_task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+
+def create_app():
+    """App factory for gunicorn (-k uvicorn.workers.UvicornWorker)"""
+    return CustomerSupportAgentApp().app
 
 
 def main():
@@ -27,10 +27,10 @@ class SimpleLauncher:
         """Start required MCP servers"""
         servers_to_start = [
             ("../../tools/database/postgres/postgres_server.py", "Database"),
-            ("../../tools/weather/weather_server.py", "Weather"), 
+            ("../../tools/weather/weather_server.py", "Weather"),
             ("../../tools/meeting/meeting_server.py", "Meeting")
         ]
-        
+
         print("🚀 Starting MCP servers...")
         for server_path, server_name in servers_to_start:
             full_path = os.path.join(self.agent_dir, server_path)
@@ -39,7 +39,8 @@ class SimpleLauncher:
                     process = subprocess.Popen(
                         [sys.executable, full_path],
                         stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL
+                        stderr=subprocess.DEVNULL,
+                        start_new_session=True
                     )
                     self.processes.append(process)
                     print(f"  ✅ {server_name} server started (PID: {process.pid})")
@@ -47,9 +48,27 @@ class SimpleLauncher:
                     print(f"  ❌ Failed to start {server_name} server: {e}")
             else:
                 print(f"  ⚠️ {server_name} server not found at {server_path}")
-        
+
         print("⏳ Waiting for servers to initialize...")
-        time.sleep(3)
+        if asyncio.run(self._wait_healthy(timeout=10.0)):
+            print("  ✅ MCP servers are responding")
+        else:
+            print("  ⚠️ MCP servers did not become healthy in time")
+
+    async def _wait_healthy(self, timeout: float = 10.0) -> bool:
+        """Poll MCP server health with exponential backoff until ready"""
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while time.monotonic() < deadline:
+            try:
+                health = await mcp_manager.check_servers_health()
+                if any(health.values()):
+                    return True
+            except Exception:
+                pass
+            await asyncio.sleep(min(0.1 * (2 ** attempt), 2.0))
+            attempt += 1
+        return False
     
     
     def stop_all(self):
@@ -105,10 +124,15 @@ class SimpleLauncher:
             print("   python -m agents.customer_support.app")
             print("\n⏹️ Press Ctrl+C to stop MCP servers")
             
-            # Keep servers running
+            # Keep servers running - block with zero CPU until a signal arrives
             try:
-                while True:
-                    time.sleep(1)
+                if hasattr(signal, 'pause'):
+                    while True:
+                        signal.pause()
+                else:
+                    # Windows has no signal.pause; fall back to long sleeps
+                    while True:
+                        time.sleep(3600)
             except KeyboardInterrupt:
                 pass
             
@@ -9,6 +9,10 @@ setup(
         # Add your dependencies here, e.g.:
         # "requests>=2.25.0",
         # "numpy>=1.20.0",
+        "uvloop>=0.17.0; sys_platform != 'win32'",
+        "httptools>=0.6.0",
+        "orjson>=3.8.0",
+        "pydantic>=2.0.0",
     ],
     author="Denser",
     author_email="support@denser.ai",
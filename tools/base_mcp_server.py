@@ -9,11 +9,29 @@ from datetime import datetime
 from typing import List, Dict, Any
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 import uvicorn
 
+# Use uvloop + httptools when installed for a faster event loop and HTTP parser
+try:
+    import uvloop  # noqa: F401
+    import httptools  # noqa: F401
+    UVICORN_LOOP = "uvloop"
+    UVICORN_HTTP = "httptools"
+except ImportError:
+    UVICORN_LOOP = "auto"
+    UVICORN_HTTP = "auto"
+
 logging.basicConfig(level=logging.INFO)
 
 
+class ToolCallRequest(BaseModel):
+    """Payload for /mcp/call_tool - validated by pydantic-core"""
+    name: str
+    arguments: Dict[str, Any] = {}
+
+
 class BaseMCPServer:
     """Base class for all MCP servers with common functionality"""
     
@@ -24,15 +42,18 @@ class BaseMCPServer:
         self.logger = logging.getLogger(f"{name}-mcp-server")
         
         # Create FastAPI app
-        self.app = FastAPI(title=f"{name.title()} MCP Server", version="1.0.0")
+        self.app = FastAPI(title=f"{name.title()} MCP Server", version="1.0.0",
+                           default_response_class=ORJSONResponse)
         
-        # Add CORS middleware
+        # Add CORS middleware with explicit lists and a long preflight
+        # max_age so browsers don't re-issue OPTIONS on every request
         self.app.add_middleware(
             CORSMiddleware,
             allow_origins=["*"],
             allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
+            allow_methods=["GET", "POST", "OPTIONS"],
+            allow_headers=["content-type", "authorization"],
+            max_age=86400,
         )
         
         # Setup common routes
@@ -47,17 +68,11 @@ class BaseMCPServer:
             return {"tools": self.tools}
         
         @self.app.post("/mcp/call_tool")
-        async def call_tool(request: dict):
+        async def call_tool(request: ToolCallRequest):
             """Call an MCP tool"""
             try:
-                tool_name = request.get("name")
-                arguments = request.get("arguments", {})
-                
-                if not tool_name:
-                    raise HTTPException(status_code=400, detail="Tool name is required")
-                
                 # Execute the tool - implemented by subclasses
-                result = await self.execute_tool(tool_name, arguments)
+                result = await self.execute_tool(request.name, request.arguments)
                 
                 return {
                     "content": [
@@ -101,4 +116,5 @@ class BaseMCPServer:
         
         self.logger.info("=" * 60)
         
-        uvicorn.run(self.app, host="0.0.0.0", port=self.port)
\ No newline at end of file
+        uvicorn.run(self.app, host="0.0.0.0", port=self.port,
+                    loop=UVICORN_LOOP, http=UVICORN_HTTP, access_log=False)
\ No newline at end of file
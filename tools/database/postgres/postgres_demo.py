@@ -4,88 +4,84 @@ Database MCP Demo Script
 Demonstrates various database operations using the generic database MCP server
 """
 
-import requests
-import json
-import time
+import asyncio
+import httpx
+import orjson
 
 DATABASE_MCP_URL = "http://localhost:8002"
 
-def call_database_tool(tool_name, arguments=None):
+# One shared async client keeps a single keep-alive connection for all
+# calls instead of a fresh TCP handshake per request
+client = httpx.AsyncClient(base_url=DATABASE_MCP_URL, timeout=30.0)
+
+async def call_database_tool(tool_name, arguments=None):
     """Helper function to call database MCP tools"""
     if arguments is None:
         arguments = {}
-    
+
     try:
-        response = requests.post(
-            f"{DATABASE_MCP_URL}/mcp/call_tool",
-            json={"name": tool_name, "arguments": arguments},
+        # orjson is ~5x faster than stdlib json on both ends
+        response = await client.post(
+            "/mcp/call_tool",
+            content=orjson.dumps({"name": tool_name, "arguments": arguments}),
             headers={"Content-Type": "application/json"}
         )
-        
+
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             return result["content"][0]["text"]
         else:
             return f"❌ Error: {response.status_code} - {response.text}"
-            
+
     except Exception as e:
         return f"❌ Connection error: {str(e)}"
 
-def demo_basic_operations():
+async def demo_basic_operations():
     """Demonstrate basic database operations"""
     print("🗄️ Database MCP Demo - Basic Operations")
     print("=" * 50)
-    
-    # List all tables
+
+    # The calls are independent - run them concurrently
+    results = await asyncio.gather(
+        call_database_tool("list_tables"),
+        call_database_tool("describe_table", {"table_name": "customers"}),
+        call_database_tool("get_table_data", {"table_name": "customers", "limit": 5})
+    )
+
     print("\n1️⃣ List all tables:")
-    result = call_database_tool("list_tables")
-    print(result)
-    
-    # Describe customers table
+    print(results[0])
+
     print("\n2️⃣ Describe customers table:")
-    result = call_database_tool("describe_table", {"table_name": "customers"})
-    print(result)
-    
-    # Get sample customer data
+    print(results[1])
+
     print("\n3️⃣ Sample customer data:")
-    result = call_database_tool("get_table_data", {"table_name": "customers", "limit": 5})
-    print(result)
+    print(results[2])
 
-def demo_analytics_queries():
+async def demo_analytics_queries():
     """Demonstrate analytics queries"""
     print("\n\n📊 Database MCP Demo - Analytics Queries")
     print("=" * 50)
-    
-    # Top customers by spending
-    print("\n1️⃣ Top 5 customers by total spent:")
-    query = """
-    SELECT first_name, last_name, total_spent 
-    FROM customers 
-    ORDER BY total_spent DESC 
+
+    top_customers_query = """
+    SELECT first_name, last_name, total_spent
+    FROM customers
+    ORDER BY total_spent DESC
     LIMIT 5
     """
-    result = call_database_tool("execute_query", {"query": query})
-    print(result)
-    
-    # Monthly sales summary
-    print("\n2️⃣ Monthly sales summary:")
-    query = """
-    SELECT 
+
+    monthly_sales_query = """
+    SELECT
         DATE_TRUNC('month', order_date) as month,
         COUNT(*) as total_orders,
         SUM(order_total) as total_revenue
-    FROM orders 
+    FROM orders
     GROUP BY DATE_TRUNC('month', order_date)
     ORDER BY month DESC
     LIMIT 6
     """
-    result = call_database_tool("execute_query", {"query": query})
-    print(result)
-    
-    # Sales by product category
-    print("\n3️⃣ Sales by product category:")
-    query = """
-    SELECT 
+
+    category_sales_query = """
+    SELECT
         p.category,
         COUNT(*) as order_count,
         SUM(o.order_total) as total_revenue
@@ -94,23 +90,29 @@ def demo_analytics_queries():
     GROUP BY p.category
     ORDER BY total_revenue DESC
     """
-    result = call_database_tool("execute_query", {"query": query})
-    print(result)
 
-def demo_product_analysis():
+    results = await asyncio.gather(
+        call_database_tool("execute_query", {"query": top_customers_query}),
+        call_database_tool("execute_query", {"query": monthly_sales_query}),
+        call_database_tool("execute_query", {"query": category_sales_query})
+    )
+
+    print("\n1️⃣ Top 5 customers by total spent:")
+    print(results[0])
+
+    print("\n2️⃣ Monthly sales summary:")
+    print(results[1])
+
+    print("\n3️⃣ Sales by product category:")
+    print(results[2])
+
+async def demo_product_analysis():
     """Demonstrate product analysis"""
     print("\n\n📦 Database MCP Demo - Product Analysis")
     print("=" * 50)
-    
-    # All products
-    print("\n1️⃣ All products:")
-    result = call_database_tool("get_table_data", {"table_name": "products", "limit": 10})
-    print(result)
-    
-    # Best selling products
-    print("\n2️⃣ Most ordered products:")
-    query = """
-    SELECT 
+
+    best_sellers_query = """
+    SELECT
         p.product_name,
         p.category,
         p.price,
@@ -121,44 +123,43 @@ def demo_product_analysis():
     ORDER BY total_sold DESC
     LIMIT 5
     """
-    result = call_database_tool("execute_query", {"query": query})
-    print(result)
 
-def demo_simple_queries():
+    results = await asyncio.gather(
+        call_database_tool("get_table_data", {"table_name": "products", "limit": 10}),
+        call_database_tool("execute_query", {"query": best_sellers_query})
+    )
+
+    print("\n1️⃣ All products:")
+    print(results[0])
+
+    print("\n2️⃣ Most ordered products:")
+    print(results[1])
+
+async def demo_simple_queries():
     """Demonstrate simple queries for chart testing"""
     print("\n\n🔍 Database MCP Demo - Chart-Ready Queries")
     print("=" * 50)
-    
-    # Customer spending (good for pie chart)
-    print("\n1️⃣ Top customers spending (pie chart data):")
-    query = """
+
+    customer_spending_query = """
     SELECT first_name || ' ' || last_name as customer_name, total_spent
-    FROM customers 
+    FROM customers
     WHERE total_spent > 0
     ORDER BY total_spent DESC
     LIMIT 5
     """
-    result = call_database_tool("execute_query", {"query": query})
-    print(result)
-    
-    # Orders by month (good for line chart)
-    print("\n2️⃣ Orders by month (line chart data):")
-    query = """
-    SELECT 
+
+    orders_by_month_query = """
+    SELECT
         TO_CHAR(order_date, 'YYYY-MM') as month,
         COUNT(*) as order_count
-    FROM orders 
+    FROM orders
     GROUP BY TO_CHAR(order_date, 'YYYY-MM')
     ORDER BY month
     LIMIT 6
     """
-    result = call_database_tool("execute_query", {"query": query})
-    print(result)
-    
-    # Category sales (good for bar chart)
-    print("\n3️⃣ Sales by category (bar chart data):")
-    query = """
-    SELECT 
+
+    category_sales_query = """
+    SELECT
         p.category,
         SUM(o.order_total) as total_sales
     FROM orders o
@@ -166,36 +167,57 @@ def demo_simple_queries():
     GROUP BY p.category
     ORDER BY total_sales DESC
     """
-    result = call_database_tool("execute_query", {"query": query})
-    print(result)
 
-def main():
+    results = await asyncio.gather(
+        call_database_tool("execute_query", {"query": customer_spending_query}),
+        call_database_tool("execute_query", {"query": orders_by_month_query}),
+        call_database_tool("execute_query", {"query": category_sales_query})
+    )
+
+    print("\n1️⃣ Top customers spending (pie chart data):")
+    print(results[0])
+
+    print("\n2️⃣ Orders by month (line chart data):")
+    print(results[1])
+
+    print("\n3️⃣ Sales by category (bar chart data):")
+    print(results[2])
+
+async def main():
     """Main demo function"""
     print("🎯 Generic Database MCP Server Demo")
     print("Using Customer Analytics Database")
     print("=" * 60)
-    
+
     # Check if database server is running
     try:
-        response = requests.get(f"{DATABASE_MCP_URL}/health")
+        response = await client.get("/health")
         if response.status_code != 200:
             print("❌ Database MCP server is not running")
             print("Please start it with: python database_server.py")
             return
-    except:
+    except Exception:
         print("❌ Cannot connect to Database MCP server")
         print("Please start it with: python database_server.py")
         return
-    
+
     print("✅ Database MCP server is running\n")
-    
+
     # Run demos
-    demo_basic_operations()
-    demo_analytics_queries()
-    demo_product_analysis()
-    demo_simple_queries()
-    
+    await demo_basic_operations()
+    await demo_analytics_queries()
+    await demo_product_analysis()
+    await demo_simple_queries()
+
+    await client.aclose()
+
     print("\n\n🎉 Demo completed!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Prefer uvloop's libuv-based loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
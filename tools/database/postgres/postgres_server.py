@@ -6,9 +6,12 @@ Provides database query tools via Model Context Protocol over HTTP
 
 import sys
 import os
-from typing import List
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import re
+import time
+from functools import lru_cache
+from typing import List, Optional
+import asyncpg
+import sqlparse
 
 # Add tools directory to path
 tools_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,18 +19,118 @@ sys.path.insert(0, tools_dir)
 
 from base_mcp_server import BaseMCPServer
 
-# Database configuration (same as setup_analytics_demo.py)
+# Database configuration (same as setup_analytics_demo.py).
+# Host/port are overridable so the server can be pointed at a PgBouncer
+# instance (e.g. POSTGRES_PORT=6432) in transaction-pooling mode, which
+# multiplexes many MCP clients onto a handful of postgres backends.
+# Transaction pooling only works with the bundled pgbouncer service's
+# settings: max_prepared_statements keeps asyncpg's named prepared
+# statements (and the transaction-scoped cursor below) alive across
+# shared backends, and the pool's server_settings are listed in
+# ignore_startup_parameters - pgbouncer accepts but does NOT apply
+# them, so plan_cache_mode and the query timeouts are only in effect
+# when connecting to postgres directly.
 DB_CONFIG = {
-    "host": "127.0.0.1",
+    "host": os.getenv("POSTGRES_HOST", "127.0.0.1"),
     "database": "product_database",
-    "user": "product_admin", 
+    "user": "product_admin",
     "password": "product123",
-    "port": 5432
+    "port": int(os.getenv("POSTGRES_PORT", "5432"))
 }
 
+# Hot metadata queries. asyncpg caches prepared statements per
+# connection automatically, so repeated calls skip parse+plan work.
+_DESCRIBE_TABLE_SQL = """
+    SELECT
+        column_name,
+        data_type,
+        is_nullable,
+        column_default,
+        character_maximum_length
+    FROM information_schema.columns
+    WHERE table_name = $1
+    ORDER BY ordinal_position
+"""
+
+_LIST_TABLES_SQL = """
+    SELECT table_name
+    FROM information_schema.tables
+    WHERE table_schema = 'public'
+    ORDER BY table_name
+"""
+
+# Constant markdown fragments, built once instead of per request
+_DESCRIBE_HEADER = (
+    "| Column Name | Data Type | Nullable | Default | Max Length |\n"
+    "|-------------|-----------|----------|---------|------------|"
+)
+
+_LIST_HEADER = "## 📋 Database Tables\n"
+
+
+# First one or two SQL keywords, skipping leading whitespace/comments -
+# bounds the .upper() call to a token instead of copying the whole query
+_FIRST_TOKEN_RE = re.compile(r"(?:\s|/\*.*?\*/|--[^\n]*\n?)*([A-Za-z]+)(?:\s+([A-Za-z]+))?", re.DOTALL)
+
+# Operations rejected by the security check
+_BANNED_OPERATIONS = frozenset({"DROP", "TRUNCATE", "ALTER", "GRANT", "REVOKE"})
+
+# Conservative filter for user-supplied WHERE fragments: no statement
+# separators, no comments, only plain comparisons and simple literals
+_WHERE_RE = re.compile(r"^[\w\s.,='<>!%()-]*$")
+
+
+def _is_safe_where(where_clause: str) -> bool:
+    if ';' in where_clause or '--' in where_clause or '/*' in where_clause:
+        return False
+    return bool(_WHERE_RE.match(where_clause))
+
+
+@lru_cache(maxsize=1024)
+def _rejected_operation(query: str) -> Optional[str]:
+    """Return the banned operation in query, or None if it's allowed.
+
+    Uses sqlparse rather than a string-prefix check so CTE prefixes,
+    comments and multi-statement payloads can't hide the verb. Cached on
+    the raw query string - the LLM repeats identical queries often.
+    """
+    for stmt in sqlparse.parse(query):
+        stmt_type = stmt.get_type()
+        if stmt_type in _BANNED_OPERATIONS:
+            return stmt_type
+
+        first = stmt.token_first(skip_cm=True)
+        if first is None:
+            continue
+
+        # Backstop: sqlparse reports some statement types (e.g. GRANT,
+        # REVOKE) as UNKNOWN, so also check the leading keyword
+        first_kw = first.normalized.upper()
+        if first_kw in _BANNED_OPERATIONS:
+            return first_kw
+
+        if first_kw == "CREATE":
+            _, nxt = stmt.token_next(stmt.token_index(first), skip_cm=True)
+            if nxt is not None and nxt.normalized.upper() == "USER":
+                return "CREATE USER"
+    return None
+
+
 class DatabaseMCPServer(BaseMCPServer):
     """Simplified Database MCP Server implementation"""
-    
+
+    # How long the table-name whitelist stays fresh (seconds)
+    TABLE_CACHE_TTL = 60
+
+    # How long formatted list_tables/describe_table results stay fresh
+    # (seconds) - schemas change rarely but the UI calls these often
+    METADATA_CACHE_TTL = 30
+
+    # Hard cap on rows rendered into one markdown result, and how many
+    # rows the server-side cursor pulls per round trip
+    MAX_RESULT_ROWS = 10_000
+    CURSOR_BATCH_SIZE = 1_000
+
     def __init__(self, port: int = 8002):
         # Define tools
         tools = [
@@ -99,232 +202,288 @@ class DatabaseMCPServer(BaseMCPServer):
                 }
             }
         ]
-        
+
         # Initialize base class
         super().__init__("database", port, tools)
-        
-        # Test database connection
-        self._test_db_connection()
-    
-    def _test_db_connection(self):
-        """Test database connection on startup"""
-        try:
-            conn = psycopg2.connect(**DB_CONFIG)
-            conn.close()
-            self.logger.info("✅ Database connection successful")
-        except Exception as e:
-            self.logger.error(f"❌ Database connection failed: {e}")
-    
-    
+
+        # Tool dispatch table - avoids an if/elif chain per call
+        self._dispatch = {
+            "execute_query": self._execute_query,
+            "describe_table": self._describe_table,
+            "list_tables": self._list_tables,
+            "get_table_data": self._get_table_data,
+        }
+
+        # asyncpg pool, created on the event loop at app startup
+        self._pool = None
+
+        # Table-name whitelist for get_table_data, refreshed with a TTL
+        self._known_tables = set()
+        self._known_tables_ts = 0.0
+
+        # (tool, table) -> (expires_at, markdown) for metadata results
+        self._metadata_cache = {}
+
+        @self.app.on_event("startup")
+        async def init_pool():
+            try:
+                await self._get_pool()
+                self.logger.info("✅ Database connection successful")
+            except Exception as e:
+                self.logger.error(f"❌ Database connection failed: {e}")
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """Get the shared asyncpg pool, creating it on first use"""
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(
+                min_size=2,
+                max_size=20,
+                statement_cache_size=500,
+                server_settings={
+                    # Re-plan each bind with the actual parameter values.
+                    # Without this, postgres switches to a generic plan
+                    # after five executions, which can be pathologically
+                    # slow for selective predicates (requires pg>=12).
+                    "plan_cache_mode": "force_custom_plan",
+                    # Make this server identifiable in pg_stat_activity
+                    "application_name": "denser-mcp",
+                    # Kill runaway queries instead of letting one bad
+                    # LLM-generated statement pin a backend
+                    "statement_timeout": "30000",
+                    # Don't let an abandoned transaction hold locks
+                    "idle_in_transaction_session_timeout": "10000",
+                },
+                **DB_CONFIG
+            )
+        return self._pool
+
+    async def _valid_table(self, conn, table_name: str) -> bool:
+        """Check table_name against a cached information_schema whitelist"""
+        now = time.monotonic()
+        if now - self._known_tables_ts >= self.TABLE_CACHE_TTL:
+            rows = await conn.fetch(_LIST_TABLES_SQL)
+            self._known_tables = {row['table_name'] for row in rows}
+            self._known_tables_ts = now
+        return table_name in self._known_tables
+
+    def _metadata_cached(self, tool: str, key: str = ""):
+        """Return a fresh cached metadata result, or None on miss"""
+        entry = self._metadata_cache.get((tool, key))
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        return None
+
+    def _metadata_store(self, tool: str, key: str, markdown: str) -> str:
+        self._metadata_cache[(tool, key)] = (time.monotonic() + self.METADATA_CACHE_TTL, markdown)
+        return markdown
+
     async def execute_tool(self, name: str, arguments: dict) -> str:
         """Execute tool logic"""
+        handler = self._dispatch.get(name)
+        if handler is None:
+            return f"❌ Unknown tool: {name}"
+
         try:
-            if name == "execute_query":
-                return await self._execute_query(
-                    arguments["query"],
-                    arguments.get("params", [])
-                )
-            
-            elif name == "describe_table":
-                return await self._describe_table(arguments["table_name"])
-            
-            elif name == "list_tables":
-                return await self._list_tables()
-            
-            elif name == "get_table_data":
-                return await self._get_table_data(
-                    arguments["table_name"],
-                    arguments.get("limit", 10),
-                    arguments.get("where_clause", "")
-                )
-            
-            else:
-                return f"❌ Unknown tool: {name}"
-                
+            return await handler(**arguments)
         except Exception as e:
             self.logger.error(f"❌ Tool error: {e}")
             return f"❌ Database error: {str(e)}"
-    
-    async def _execute_query(self, query: str, params: List[str] = None) -> str:
-        """Execute a SQL query"""
+
+    async def _execute_query(self, query: str, params: List[str] = None, **_ignored) -> str:
+        """Execute a SQL query
+
+        Statements are cached by asyncpg, but the pool sets
+        plan_cache_mode=force_custom_plan so postgres re-plans each bind
+        with real parameter values instead of falling back to a generic
+        plan after warm-up.
+        """
         if params is None:
             params = []
-        
+
         try:
-            # Security check - prevent certain dangerous operations
-            query_upper = query.upper().strip()
-            dangerous_operations = ['DROP', 'TRUNCATE', 'ALTER', 'CREATE USER', 'GRANT', 'REVOKE']
-            for op in dangerous_operations:
-                if query_upper.startswith(op):
-                    return f"❌ Operation '{op}' is not allowed for security reasons"
-            
-            conn = psycopg2.connect(**DB_CONFIG)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Execute query
-            cursor.execute(query, params)
-            
-            # Handle different query types
-            if query_upper.startswith('SELECT'):
-                results = cursor.fetchall()
-                conn.close()
-                
-                if not results:
-                    return "📊 Query executed successfully - No results found"
-                
-                # Format results as markdown table
-                formatted_results = f"## 📊 Query Results ({len(results)} rows)\n\n"
-                
-                if results:
-                    # Get column names from first row
-                    columns = list(results[0].keys())
-                    
-                    # Create markdown table header
-                    formatted_results += "| " + " | ".join(columns) + " |\n"
-                    formatted_results += "|" + "|".join(["---" for _ in columns]) + "|\n"
-                    
-                    # Add data rows
-                    for row in results:
-                        values = [str(row[col]) if row[col] is not None else "NULL" for col in columns]
-                        formatted_results += "| " + " | ".join(values) + " |\n"
-                
-                formatted_results += f"\n✅ Total rows: {len(results)}"
-                return formatted_results
-            
-            else:
-                # For INSERT, UPDATE, DELETE
-                affected_rows = cursor.rowcount
-                conn.commit()
-                conn.close()
-                
-                operation = query_upper.split()[0]
-                return f"✅ {operation} executed successfully - {affected_rows} rows affected"
-                
+            # Security check - prevent certain dangerous operations.
+            # Validated on the parsed statement type, not a string prefix.
+            banned = _rejected_operation(query)
+            if banned:
+                return f"❌ Operation '{banned}' is not allowed for security reasons"
+
+            # The leading keyword still routes fetch vs execute below
+            match = _FIRST_TOKEN_RE.match(query)
+            first_token = match.group(1).upper() if match and match.group(1) else ""
+
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                if first_token == "SELECT":
+                    # Stream rows through a server-side cursor (scoped to
+                    # this transaction, so safe under transaction pooling)
+                    # instead of materializing an unbounded result set
+                    results = []
+                    truncated = False
+                    async with conn.transaction():
+                        cursor = await conn.cursor(query, *params)
+                        while True:
+                            batch = await cursor.fetch(self.CURSOR_BATCH_SIZE)
+                            if not batch:
+                                break
+                            results.extend(batch)
+                            if len(results) >= self.MAX_RESULT_ROWS:
+                                del results[self.MAX_RESULT_ROWS:]
+                                truncated = True
+                                break
+                else:
+                    # For INSERT, UPDATE, DELETE - status is e.g. "UPDATE 3"
+                    status = await conn.execute(query, *params)
+                    parts = status.split()
+                    affected_rows = parts[-1] if parts and parts[-1].isdigit() else 0
+                    if first_token == "CREATE":
+                        # Schema may have changed - drop stale metadata
+                        self._metadata_cache.clear()
+                        self._known_tables_ts = 0.0
+                    return f"✅ {first_token} executed successfully - {affected_rows} rows affected"
+
+            if not results:
+                return "📊 Query executed successfully - No results found"
+
+            # Format results as markdown table, built as a list and
+            # joined once - avoids quadratic string concatenation
+            columns = list(results[0].keys())
+            parts = [
+                f"## 📊 Query Results ({len(results)} rows)",
+                "",
+                "| " + " | ".join(columns) + " |",
+                "|" + "|".join(["---" for _ in columns]) + "|",
+            ]
+            parts.extend(
+                "| " + " | ".join("NULL" if v is None else str(v) for v in row.values()) + " |"
+                for row in results
+            )
+            if truncated:
+                parts.append(
+                    f"\n⚠️ Output truncated at {self.MAX_RESULT_ROWS} rows - "
+                    "add a LIMIT clause to narrow the query"
+                )
+            parts.append(f"\n✅ Total rows: {len(results)}")
+            return "\n".join(parts)
+
         except Exception as e:
             return f"❌ Query execution error: {str(e)}"
-    
-    async def _describe_table(self, table_name: str) -> str:
+
+    async def _describe_table(self, table_name: str, **_ignored) -> str:
         """Get table structure"""
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Get table schema
-            query = """
-                SELECT 
-                    column_name,
-                    data_type,
-                    is_nullable,
-                    column_default,
-                    character_maximum_length
-                FROM information_schema.columns 
-                WHERE table_name = %s
-                ORDER BY ordinal_position
-            """
-            cursor.execute(query, (table_name,))
-            
-            columns = cursor.fetchall()
-            conn.close()
-            
+            cached = self._metadata_cached('describe_table', table_name)
+            if cached is not None:
+                return cached
+
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                columns = await conn.fetch(_DESCRIBE_TABLE_SQL, table_name)
+
             if not columns:
                 return f"❌ Table '{table_name}' not found"
-            
+
             # Format table structure as markdown
-            result = f"## 📋 Table Structure: `{table_name}`\n\n"
-            result += "| Column Name | Data Type | Nullable | Default | Max Length |\n"
-            result += "|-------------|-----------|----------|---------|------------|\n"
-            
+            parts = [
+                f"## 📋 Table Structure: `{table_name}`",
+                "",
+                _DESCRIBE_HEADER,
+            ]
             for col in columns:
                 nullable = "YES" if col['is_nullable'] == 'YES' else "NO"
                 default = col['column_default'] or "None"
                 max_len = col['character_maximum_length'] or "N/A"
-                
-                result += f"| {col['column_name']} | {col['data_type']} | {nullable} | {default} | {max_len} |\n"
-            
-            return result
-            
+
+                parts.append(f"| {col['column_name']} | {col['data_type']} | {nullable} | {default} | {max_len} |")
+            parts.append("")
+
+            return self._metadata_store('describe_table', table_name, "\n".join(parts))
+
         except Exception as e:
             return f"❌ Error describing table: {str(e)}"
-    
-    async def _list_tables(self) -> str:
+
+    async def _list_tables(self, **_ignored) -> str:
         """List all tables in the database"""
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            query = """
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-                ORDER BY table_name
-            """
-            cursor.execute(query)
-            
-            tables = cursor.fetchall()
-            conn.close()
-            
+            cached = self._metadata_cached('list_tables')
+            if cached is not None:
+                return cached
+
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                tables = await conn.fetch(_LIST_TABLES_SQL)
+
             if not tables:
                 return "📋 No tables found in the database"
-            
-            result = "## 📋 Database Tables\n\n"
-            for i, table in enumerate(tables, 1):
-                result += f"{i}. **{table['table_name']}**\n"
-            
-            return result
-            
+
+            parts = [_LIST_HEADER]
+            parts.extend(
+                f"{i}. **{table['table_name']}**"
+                for i, table in enumerate(tables, 1)
+            )
+            parts.append("")
+
+            return self._metadata_store('list_tables', "", "\n".join(parts))
+
         except Exception as e:
             return f"❌ Error listing tables: {str(e)}"
-    
-    async def _get_table_data(self, table_name: str, limit: int = 10, where_clause: str = "") -> str:
+
+    async def _get_table_data(self, table_name: str, limit: int = 10, where_clause: str = "", **_ignored) -> str:
         """Get sample data from a table"""
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Build query
-            query = f"SELECT * FROM {table_name}"
-            if where_clause:
-                query += f" WHERE {where_clause}"
-            query += f" LIMIT {limit}"
-            
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            conn.close()
-            
+            if where_clause and not _is_safe_where(where_clause):
+                return "❌ Unsupported where_clause - only simple comparisons are allowed"
+
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                # Whitelist the table name so the quoted identifier is
+                # safe, and bind the limit so the plan can be reused
+                if not await self._valid_table(conn, table_name):
+                    return f"❌ Table '{table_name}' not found"
+
+                query = f'SELECT * FROM "{table_name}"'
+                if where_clause:
+                    query += f" WHERE {where_clause}"
+                query += " LIMIT $1"
+
+                rows = await conn.fetch(query, limit)
+
             if not rows:
                 return f"📊 No data found in table '{table_name}'"
-            
-            # Format results as markdown table
-            result = f"## 📊 Sample Data from `{table_name}` ({len(rows)} rows)\n\n"
-            
-            if rows:
-                # Get column names from first row
-                columns = list(rows[0].keys())
-                
-                # Create markdown table header
-                result += "| " + " | ".join(columns) + " |\n"
-                result += "|" + "|".join(["---" for _ in columns]) + "|\n"
-                
-                # Add data rows
-                for row in rows:
-                    values = [str(row[col]) if row[col] is not None else "NULL" for col in columns]
-                    result += "| " + " | ".join(values) + " |\n"
-            
-            return result
-            
+
+            # Format results as markdown table, built as a list and
+            # joined once - avoids quadratic string concatenation
+            columns = list(rows[0].keys())
+            parts = [
+                f"## 📊 Sample Data from `{table_name}` ({len(rows)} rows)",
+                "",
+                "| " + " | ".join(columns) + " |",
+                "|" + "|".join(["---" for _ in columns]) + "|",
+            ]
+            parts.extend(
+                "| " + " | ".join("NULL" if v is None else str(v) for v in row.values()) + " |"
+                for row in rows
+            )
+            parts.append("")
+            return "\n".join(parts)
+
         except Exception as e:
             return f"❌ Error getting table data: {str(e)}"
-    
+
     def start_server(self):
         """Start the Database MCP server"""
+        self.logger.info(
+            f"🗄️ Database target: {DB_CONFIG['host']}:{DB_CONFIG['port']} "
+            "(set POSTGRES_PORT=6432 to route through PgBouncer transaction pooling)"
+        )
         tool_descriptions = [
             "execute_query - Execute SQL queries",
-            "describe_table - Get table structure", 
+            "describe_table - Get table structure",
             "list_tables - List all tables",
             "get_table_data - Get sample table data"
         ]
         super().start_server(tool_descriptions)
 
+
 if __name__ == "__main__":
     server = DatabaseMCPServer()
-    server.start_server()
\ No newline at end of file
+    server.start_server()
@@ -4,10 +4,12 @@ Setup Customer Analytics Demo Database
 Creates sample tables and data to demonstrate generic database MCP usage
 """
 
+import io
 import psycopg2
-from psycopg2.extras import RealDictCursor
-import random
-from datetime import datetime, timedelta
+from psycopg2.extras import execute_values
+import numpy as np
+from collections import defaultdict
+from datetime import datetime
 from faker import Faker
 
 # Database configuration (same as other servers)
@@ -20,7 +22,8 @@ DB_CONFIG = {
 }
 
 fake = Faker()
-random.seed(42)  # For reproducible data
+fake.seed_instance(42)
+rng = np.random.default_rng(42)  # For reproducible data
 
 def create_analytics_tables():
     """Create customer analytics tables"""
@@ -65,32 +68,51 @@ def create_analytics_tables():
     conn.close()
     print("✅ Analytics tables created successfully")
 
+def copy_rows(cursor, table, columns, rows):
+    """Bulk-load rows with COPY FROM STDIN - bypasses per-row parsing"""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(r"\N" if v is None else str(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    cursor.copy_from(buf, table, columns=columns)
+
 def insert_sample_data():
     """Insert sample data for demonstration"""
     conn = psycopg2.connect(**DB_CONFIG)
     cursor = conn.cursor()
-    
+
+    # Everything below runs in one transaction (psycopg2 default), and
+    # FK checks are deferred to replica mode for the duration of the load
+    cursor.execute("SET session_replication_role = replica")
+
     # Clear existing data
     cursor.execute("DELETE FROM orders")
     cursor.execute("DELETE FROM products")
     cursor.execute("DELETE FROM customers")
     
-    # Insert sample customers
+    # Insert sample customers. Faker costs milliseconds per call, so
+    # draw small pools up front and sample from them instead of paying
+    # that price per row
+    first_names = [fake.first_name() for _ in range(20)]
+    last_names = [fake.last_name() for _ in range(20)]
+    cities = [fake.city() for _ in range(15)]
+    domains = [fake.domain_name() for _ in range(5)]
+
     customers_data = []
     for i in range(50):
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        email = f"{first_name.lower()}.{last_name.lower()}@{fake.domain_name()}"
-        city = fake.city()
-        
+        first_name = first_names[rng.integers(0, len(first_names))]
+        last_name = last_names[rng.integers(0, len(last_names))]
+        email = f"{first_name.lower()}.{last_name.lower()}{i}@{domains[rng.integers(0, len(domains))]}"
+        city = cities[rng.integers(0, len(cities))]
+
         customers_data.append((
             first_name, last_name, email, city, 0.00
         ))
     
-    cursor.executemany("""
-        INSERT INTO customers (first_name, last_name, email, city, total_spent)
-        VALUES (%s, %s, %s, %s, %s)
-    """, customers_data)
+    copy_rows(cursor, "customers",
+              ("first_name", "last_name", "email", "city", "total_spent"),
+              customers_data)
     
     # Insert sample products
     products_data = [
@@ -106,10 +128,9 @@ def insert_sample_data():
         ('Backpack', 'Accessories', 69.99)
     ]
     
-    cursor.executemany("""
-        INSERT INTO products (product_name, category, price)
-        VALUES (%s, %s, %s)
-    """, products_data)
+    copy_rows(cursor, "products",
+              ("product_name", "category", "price"),
+              products_data)
     
     # Insert sample orders
     cursor.execute("SELECT customer_id FROM customers")
@@ -118,34 +139,42 @@ def insert_sample_data():
     cursor.execute("SELECT product_id, price FROM products")
     products = cursor.fetchall()
     
+    # Generate all 200 orders as vectorized draws - no per-row Faker or
+    # random calls on the hot path
+    num_orders = 200
+    product_ids = np.array([p[0] for p in products])
+    prices = np.array([float(p[1]) for p in products])
+
+    cust = rng.choice(customer_ids, size=num_orders)
+    prod_idx = rng.integers(0, len(products), size=num_orders)
+    qty = rng.integers(1, 4, size=num_orders)
+    totals = np.round(prices[prod_idx] * qty, 2)
+    start = np.datetime64(datetime.now().date()) - np.timedelta64(365, 'D')
+    dates = start + rng.integers(0, 366, size=num_orders).astype('timedelta64[D]')
+
     orders_data = []
-    
-    for i in range(200):  # 200 orders
-        customer_id = random.choice(customer_ids)
-        product_id, price = random.choice(products)
-        quantity = random.randint(1, 3)
-        order_total = round(float(price) * quantity, 2)
-        order_date = fake.date_between(start_date='-1y', end_date='today')
-        
+    spent = defaultdict(float)  # per-customer totals, tracked as we generate
+
+    for c, p, q, total, d in zip(cust, prod_idx, qty, totals, dates):
         orders_data.append((
-            customer_id, product_id, quantity, order_total, order_date
+            int(c), int(product_ids[p]), int(q), float(total), d.item()
         ))
-    
-    cursor.executemany("""
-        INSERT INTO orders (customer_id, product_id, quantity, order_total, order_date)
-        VALUES (%s, %s, %s, %s, %s)
-    """, orders_data)
-    
-    # Update customer total_spent
-    cursor.execute("""
-        UPDATE customers 
-        SET total_spent = (
-            SELECT COALESCE(SUM(order_total), 0) 
-            FROM orders 
-            WHERE orders.customer_id = customers.customer_id
-        )
-    """)
-    
+        spent[int(c)] += float(total)
+    
+    copy_rows(cursor, "orders",
+              ("customer_id", "product_id", "quantity", "order_total", "order_date"),
+              orders_data)
+    
+    # total_spent is already known from order generation - push the
+    # Python-side totals instead of re-aggregating on the server
+    execute_values(cursor, """
+        UPDATE customers
+        SET total_spent = v.total
+        FROM (VALUES %s) v(customer_id, total)
+        WHERE customers.customer_id = v.customer_id
+    """, [(cid, round(total, 2)) for cid, total in spent.items()], page_size=1000)
+
+    cursor.execute("SET session_replication_role = DEFAULT")
     conn.commit()
     conn.close()
     print("✅ Sample data inserted successfully")
@@ -5,19 +5,48 @@ Centralized management for multiple MCP servers and their tools
 """
 
 import asyncio
-import json
 import logging
 import os
+import time
 from typing import Dict, List, Any, Optional
 import httpx
+import orjson
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mcp-tools-manager")
 
+# Read-only/idempotent tools that are safe to coalesce. Mutating calls
+# (execute_query can INSERT/UPDATE/DELETE) must each run, even when two
+# users submit the identical statement at the same time.
+_COALESCABLE_TOOLS = frozenset({
+    "get_current_weather",
+    "get_weather_forecast",
+    "get_weather_alerts",
+    "list_tables",
+    "describe_table",
+    "get_table_data",
+    "schedule_meeting",
+})
+
+# Per-endpoint timeouts: health probes and discovery should fail fast,
+# while actual tool calls can legitimately take a while
+_HEALTH_TIMEOUT = httpx.Timeout(connect=1.0, read=2.0, write=2.0, pool=0.5)
+_LIST_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=1.0)
+_CALL_TIMEOUT = httpx.Timeout(connect=2.0, read=30.0, write=10.0, pool=1.0)
+
 
 class MCPToolsManager:
     """Simplified manager for multiple MCP servers and their tools"""
-    
+
+    # How long a health-check result stays fresh (seconds)
+    HEALTH_TTL = 2.0
+
+    # How long a discovered tool list stays fresh (seconds)
+    TOOLS_TTL = 60.0
+
+    # Hard cap on any single MCP response body (bytes)
+    MAX_BODY_BYTES = 4_000_000
+
     def __init__(self, config_file: str = None):
         if config_file is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -25,21 +54,36 @@ class MCPToolsManager:
         self.config_file = config_file
         self.servers = {}
         self.tools = {}
+        self._by_server: Dict[str, List[str]] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._anthropic_tools: Optional[List[Dict[str, Any]]] = None
+        self._tools_cache_ts = 0.0
+        self._discover_lock = asyncio.Lock()
+        self._health_result = None
+        self._health_cached_at = 0.0
+        self._health_task: Optional[asyncio.Task] = None
+        # key -> [task, n_waiters] for coalesced in-flight tool calls
+        self._inflight: Dict[tuple, list] = {}
         self.load_configuration()
     
     def load_configuration(self):
         """Load MCP server configuration from file"""
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                config = orjson.loads(f.read())
             
             mcp_servers = config.get('mcpServers', {})
             for server_name, server_config in mcp_servers.items():
                 transport = server_config.get('transport', {})
+                base_url = transport.get('baseUrl', '')
+                endpoints = transport.get('endpoints', {})
                 self.servers[server_name] = {
                     'name': server_name,
-                    'base_url': transport.get('baseUrl', ''),
-                    'endpoints': transport.get('endpoints', {}),
+                    'base_url': base_url,
+                    'endpoints': endpoints,
+                    # Full URLs resolved once here, not per request
+                    'urls': {k: base_url + v for k, v in endpoints.items()},
                     'description': server_config.get('description', '')
                 }
             
@@ -49,95 +93,235 @@ class MCPToolsManager:
             logger.error(f"❌ Failed to load MCP configuration: {e}")
     
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client - one handshake per server, not per call
+
+        The client is bound to the running event loop: startup code runs
+        asyncio.run() before uvicorn starts its own loop, and keep-alive
+        connections pooled on that first, closed loop would fail when
+        reused, so the client is recreated whenever the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0
+                ),
+                timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0)
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client and its pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    async def _read_body_capped(self, response) -> bytearray:
+        """Accumulate a streamed body, failing fast past MAX_BODY_BYTES"""
+        buf = bytearray()
+        async for chunk in response.aiter_bytes():
+            buf += chunk
+            if len(buf) > self.MAX_BODY_BYTES:
+                raise RuntimeError(
+                    f"Response body exceeds {self.MAX_BODY_BYTES} bytes"
+                )
+        return buf
+
     async def discover_tools(self) -> Dict[str, List[Dict]]:
-        """Discover all available tools from all MCP servers"""
+        """Discover all available tools from all MCP servers
+
+        Servers are queried concurrently, so wall time is the slowest
+        server's latency rather than the sum of all of them.
+        """
         all_tools = {}
-        for server_name, server in self.servers.items():
-            try:
-                tools = await self._get_server_tools(server)
-                all_tools[server_name] = tools
-                
-                # Add to global tools registry
-                for tool in tools:
-                    self.tools[tool['name']] = tool
-                
-                logger.info(f"✅ Discovered {len(tools)} tools from {server_name}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to discover tools from {server_name}: {e}")
+        results = await asyncio.gather(
+            *(self._get_server_tools(server) for server in self.servers.values()),
+            return_exceptions=True
+        )
+
+        for server_name, tools in zip(self.servers.keys(), results):
+            if isinstance(tools, BaseException):
+                logger.error(f"❌ Failed to discover tools from {server_name}: {tools}")
                 all_tools[server_name] = []
-        
+                continue
+
+            all_tools[server_name] = tools
+
+            # Add to global tools registry
+            for tool in tools:
+                self.tools[tool['name']] = tool
+
+            logger.info(f"✅ Discovered {len(tools)} tools from {server_name}")
+
         return all_tools
     
     async def _get_server_tools(self, server: Dict) -> List[Dict]:
         """Get tools from a specific MCP server"""
-        async with httpx.AsyncClient() as client:
-            url = f"{server['base_url']}{server['endpoints']['listTools']}"
-            response = await client.get(url, timeout=10.0)
+        client = self._get_client()
+        url = server['urls']['listTools']
+        # Stream the body so a misbehaving server can't balloon memory
+        async with client.stream("GET", url, timeout=_LIST_TIMEOUT) as response:
             response.raise_for_status()
-            
-            data = response.json()
-            tools = data.get('tools', [])
-            
-            # Add server info to each tool
-            for tool in tools:
-                tool['server_name'] = server['name']
-                tool['server_url'] = server['base_url']
-            
-            return tools
+            buf = await self._read_body_capped(response)
+
+        data = orjson.loads(buf)
+        tools = data.get('tools', [])
+
+        # Add server info to each tool, and build the Anthropic-format
+        # descriptor once here instead of per LLM turn
+        for tool in tools:
+            tool['server_name'] = server['name']
+            tool['server_url'] = server['base_url']
+            tool['_anthropic_view'] = {
+                "name": tool['name'],
+                "description": f"[{server['name']}] {tool.get('description', '')}",
+                "input_schema": tool['inputSchema']
+            }
+
+        # Refresh this server's slice of the by-server index in place
+        self._by_server[server['name']] = [tool['name'] for tool in tools]
+
+        return tools
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
-        """Call a specific tool by name"""
+        """Call a specific tool by name
+
+        Identical concurrent calls to read-only tools are coalesced
+        (single-flight): later awaiters piggyback on the first call's
+        in-flight HTTP request instead of issuing their own. Mutating
+        tools always execute once per call.
+        """
         if tool_name not in self.tools:
-            available_tools = list(self.tools.keys())
-            return f"❌ Tool '{tool_name}' not found. Available tools: {', '.join(available_tools)}"
-        
+            # Join the dict keys directly - no intermediate list
+            return f"❌ Tool '{tool_name}' not found. Available tools: {', '.join(self.tools)}"
+
+        if tool_name not in _COALESCABLE_TOOLS:
+            return await self._call_tool(tool_name, arguments)
+
+        key = (tool_name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS))
+        entry = self._inflight.get(key)
+        if entry is None:
+            entry = self._inflight[key] = [
+                asyncio.ensure_future(self._call_tool(tool_name, arguments)),
+                0  # number of awaiters sharing this task
+            ]
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # Shield the shared task: one awaiter being cancelled (e.g.
+            # its chat stream died) must not cancel the same call for
+            # every coalesced co-awaiter
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Last awaiter standing takes the underlying call down with it
+            if entry[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._inflight.pop(key, None)
+
+    async def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+        """Issue the HTTP request for one tool call"""
         tool = self.tools[tool_name]
         server = self.servers[tool['server_name']]
-        
+
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{server['base_url']}{server['endpoints']['callTool']}"
-                payload = {"name": tool_name, "arguments": arguments}
-                
-                response = await client.post(url, json=payload, timeout=30.0)
+            client = self._get_client()
+            url = server['urls']['callTool']
+            payload = {"name": tool_name, "arguments": arguments}
+
+            # orjson both ways - faster than stdlib json on the nested
+            # schema/result dicts - and a streamed, size-capped read
+            async with client.stream(
+                "POST",
+                url,
+                content=orjson.dumps(payload),
+                headers={"content-type": "application/json"},
+                timeout=_CALL_TIMEOUT
+            ) as response:
                 response.raise_for_status()
-                
-                result = response.json()
-                return result["content"][0]["text"]
-                
+                buf = await self._read_body_capped(response)
+
+            result = orjson.loads(buf)
+            return result["content"][0]["text"]
+
         except Exception as e:
             logger.error(f"❌ Tool call error for {tool_name}: {e}")
             return f"❌ Error calling {tool_name}: {str(e)}"
     
     async def get_all_tools_for_llm(self) -> List[Dict[str, Any]]:
-        """Get all tools formatted for LLM use (Anthropic format)"""
-        await self.discover_tools()
-        
-        anthropic_tools = []
-        for tool in self.tools.values():
-            anthropic_tools.append({
-                "name": tool['name'],
-                "description": f"[{tool['server_name']}] {tool['description']}",
-                "input_schema": tool['inputSchema']
-            })
-        
-        return anthropic_tools
+        """Get all tools formatted for LLM use (Anthropic format)
+
+        Discovery is re-run at most every TOOLS_TTL seconds; in between,
+        the cached list is returned without touching the network. The
+        lock coalesces concurrent refreshes into one discovery pass.
+        """
+        if self._anthropic_tools is not None and \
+                time.monotonic() - self._tools_cache_ts < self.TOOLS_TTL:
+            return self._anthropic_tools
+
+        async with self._discover_lock:
+            # Re-check: another caller may have refreshed while we waited
+            if self._anthropic_tools is not None and \
+                    time.monotonic() - self._tools_cache_ts < self.TOOLS_TTL:
+                return self._anthropic_tools
+
+            await self.discover_tools()
+
+            # Descriptors were precomputed at discovery time
+            anthropic_tools = [tool['_anthropic_view'] for tool in self.tools.values()]
+
+            # Don't cache a failed/empty discovery - a transient outage
+            # shouldn't leave chats tool-less for a whole TTL window
+            if anthropic_tools:
+                self._anthropic_tools = anthropic_tools
+                self._tools_cache_ts = time.monotonic()
+            return anthropic_tools
     
     async def check_servers_health(self) -> Dict[str, bool]:
-        """Check health of all MCP servers"""
-        health_status = {}
-        
-        for server_name, server in self.servers.items():
+        """Check health of all MCP servers (single-flight, short TTL cache)
+
+        Concurrent callers share one in-flight probe, and the result is
+        reused for HEALTH_TTL seconds so bursts of requests don't fan out
+        repeated health probes to every server.
+        """
+        now = time.monotonic()
+        if self._health_result is not None and now - self._health_cached_at < self.HEALTH_TTL:
+            return self._health_result
+
+        if self._health_task is not None:
+            return await self._health_task
+
+        self._health_task = asyncio.ensure_future(self._check_servers_health())
+        try:
+            result = await self._health_task
+            self._health_result = result
+            self._health_cached_at = time.monotonic()
+            return result
+        finally:
+            self._health_task = None
+
+    async def _check_servers_health(self) -> Dict[str, bool]:
+        """Probe every MCP server's health endpoint concurrently"""
+        async def probe(server: Dict) -> bool:
             try:
-                async with httpx.AsyncClient() as client:
-                    url = f"{server['base_url']}{server['endpoints']['health']}"
-                    response = await client.get(url, timeout=5.0)
-                    health_status[server_name] = response.status_code == 200
+                url = server['urls']['health']
+                response = await self._get_client().get(url, timeout=_HEALTH_TIMEOUT)
+                return response.status_code == 200
             except:
-                health_status[server_name] = False
-        
-        return health_status
+                return False
+
+        results = await asyncio.gather(
+            *(probe(server) for server in self.servers.values())
+        )
+        return dict(zip(self.servers.keys(), results))
     
     def get_tool_info(self, tool_name: str) -> Optional[Dict]:
         """Get information about a specific tool"""
@@ -148,16 +332,13 @@ class MCPToolsManager:
         return self.servers.get(server_name)
     
     def list_tools_by_server(self) -> Dict[str, List[str]]:
-        """List all tools grouped by server"""
-        tools_by_server = {}
-        
-        for tool_name, tool in self.tools.items():
-            server_name = tool['server_name']
-            if server_name not in tools_by_server:
-                tools_by_server[server_name] = []
-            tools_by_server[server_name].append(tool_name)
-        
-        return tools_by_server
+        """List all tools grouped by server
+
+        The index is maintained at discovery time, so this is O(servers)
+        rather than a walk over every tool. Lists are shallow-copied so
+        callers can't mutate the index.
+        """
+        return {name: list(tools) for name, tools in self._by_server.items()}
     
     async def add_server(self, server_name: str, base_url: str, 
                         endpoints: Dict[str, str], description: str = "") -> bool:
@@ -166,6 +347,8 @@ class MCPToolsManager:
             'name': server_name,
             'base_url': base_url,
             'endpoints': endpoints,
+            # Full URLs resolved once here, not per request
+            'urls': {k: base_url + v for k, v in endpoints.items()},
             'description': description
         }
         
@@ -176,13 +359,17 @@ class MCPToolsManager:
             
             for tool in tools:
                 self.tools[tool['name']] = tool
-            
+
+            # Force the next get_all_tools_for_llm to rebuild its cache
+            self._tools_cache_ts = 0.0
+
             logger.info(f"✅ Added server {server_name} with {len(tools)} tools")
             return True
             
         except Exception as e:
             logger.error(f"❌ Failed to add server {server_name}: {e}")
             del self.servers[server_name]
+            self._by_server.pop(server_name, None)
             return False
     
     def get_stats(self) -> Dict[str, Any]:
@@ -227,4 +414,10 @@ async def main():
         print(f"   • {server}: {status}")
 
 if __name__ == "__main__":
+    # Prefer uvloop's libuv-based loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -13,42 +13,48 @@ sys.path.insert(0, tools_dir)
 
 from base_mcp_server import BaseMCPServer
 
+# Tool definitions are static - built once at import time rather than
+# per server instantiation, and importable without creating a server
+_MEETING_TOOLS = [
+    {
+        "name": "schedule_meeting",
+        "description": "Generate a meeting scheduling link for the user",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    }
+]
+
 
 class MeetingMCPServer(BaseMCPServer):
     """Simplified Meeting MCP Server implementation"""
 
     def __init__(self, meeting_url: str, port: int = 8004):
-        # Define tools
-        tools = [
-            {
-                "name": "schedule_meeting",
-                "description": "Generate a meeting scheduling link for the user",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            }
-        ]
-
         # Initialize base class
-        super().__init__("meeting", port, tools)
+        super().__init__("meeting", port, _MEETING_TOOLS)
 
         self.meeting_url = meeting_url
 
+        # Tool dispatch table - avoids an if/elif chain per call
+        self._dispatch = {
+            "schedule_meeting": self._schedule_meeting,
+        }
+
     async def execute_tool(self, name: str, arguments: dict) -> str:
         """Execute tool logic"""
-        try:
-            if name == "schedule_meeting":
-                return await self._schedule_meeting()
-            else:
-                return f"❌ Unknown tool: {name}"
+        handler = self._dispatch.get(name)
+        if handler is None:
+            return f"❌ Unknown tool: {name}"
 
+        try:
+            return await handler(**arguments)
         except Exception as e:
             self.logger.error(f"❌ Tool error: {e}")
             return f"❌ Meeting error: {str(e)}"
 
-    async def _schedule_meeting(self) -> str:
+    async def _schedule_meeting(self, **_ignored) -> str:
         """Generate meeting scheduling response"""
         return f"""I'd be happy to help you schedule a meeting!
 
@@ -10,146 +10,213 @@ import os
 tools_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, tools_dir)
 
+import random
+import time
+from collections import Counter, OrderedDict
+
 import httpx
+import orjson
 from datetime import datetime, timedelta
 from base_mcp_server import BaseMCPServer
 
-class WeatherMCPServer(BaseMCPServer):
-    """Simplified Weather MCP Server implementation"""
-    
-    def __init__(self, port: int = 8001):
-        # Define tools
-        tools = [
-            {
-                "name": "get_current_weather",
-                "description": "Get current weather conditions for a specific location",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "location": {
-                            "type": "string",
-                            "description": "City name, state/country (e.g., 'Sunnyvale, CA' or 'London, UK')"
-                        },
-                        "units": {
-                            "type": "string",
-                            "description": "Temperature units (metric, imperial, kelvin)",
-                            "enum": ["metric", "imperial", "kelvin"],
-                            "default": "imperial"
-                        }
-                    },
-                    "required": ["location"]
+# Condition pools for simulated data, allocated once
+_SIM_CONDITIONS = ("Clear", "Partly Cloudy", "Cloudy", "Light Rain", "Sunny")
+_SIM_FORECAST_CONDITIONS = ("Sunny", "Partly Cloudy", "Cloudy", "Light Rain", "Clear")
+
+# Tool definitions are static - built once at import time rather than
+# per server instantiation, and importable without creating a server
+_WEATHER_TOOLS = [
+    {
+        "name": "get_current_weather",
+        "description": "Get current weather conditions for a specific location",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "location": {
+                    "type": "string",
+                    "description": "City name, state/country (e.g., 'Sunnyvale, CA' or 'London, UK')"
+                },
+                "units": {
+                    "type": "string",
+                    "description": "Temperature units (metric, imperial, kelvin)",
+                    "enum": ["metric", "imperial", "kelvin"],
+                    "default": "imperial"
                 }
             },
-            {
-                "name": "get_weather_forecast",
-                "description": "Get weather forecast for a specific location (5-day forecast)",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "location": {
-                            "type": "string",
-                            "description": "City name, state/country (e.g., 'Sunnyvale, CA' or 'London, UK')"
-                        },
-                        "days": {
-                            "type": "integer",
-                            "description": "Number of days for forecast (1-5)",
-                            "minimum": 1,
-                            "maximum": 5,
-                            "default": 3
-                        },
-                        "units": {
-                            "type": "string",
-                            "description": "Temperature units (metric, imperial, kelvin)",
-                            "enum": ["metric", "imperial", "kelvin"],
-                            "default": "imperial"
-                        }
-                    },
-                    "required": ["location"]
+            "required": ["location"]
+        }
+    },
+    {
+        "name": "get_weather_forecast",
+        "description": "Get weather forecast for a specific location (5-day forecast)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "location": {
+                    "type": "string",
+                    "description": "City name, state/country (e.g., 'Sunnyvale, CA' or 'London, UK')"
+                },
+                "days": {
+                    "type": "integer",
+                    "description": "Number of days for forecast (1-5)",
+                    "minimum": 1,
+                    "maximum": 5,
+                    "default": 3
+                },
+                "units": {
+                    "type": "string",
+                    "description": "Temperature units (metric, imperial, kelvin)",
+                    "enum": ["metric", "imperial", "kelvin"],
+                    "default": "imperial"
                 }
             },
-            {
-                "name": "get_weather_alerts",
-                "description": "Get weather alerts and warnings for a specific location",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "location": {
-                            "type": "string",
-                            "description": "City name, state/country (e.g., 'Sunnyvale, CA' or 'London, UK')"
-                        }
-                    },
-                    "required": ["location"]
+            "required": ["location"]
+        }
+    },
+    {
+        "name": "get_weather_alerts",
+        "description": "Get weather alerts and warnings for a specific location",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "location": {
+                    "type": "string",
+                    "description": "City name, state/country (e.g., 'Sunnyvale, CA' or 'London, UK')"
                 }
-            }
-        ]
-        
+            },
+            "required": ["location"]
+        }
+    }
+]
+
+
+class WeatherMCPServer(BaseMCPServer):
+    """Simplified Weather MCP Server implementation"""
+
+    # TTLs for cached OpenWeatherMap responses (seconds) - current
+    # conditions go stale faster than forecasts - and the LRU bound
+    CURRENT_CACHE_TTL = 120.0
+    FORECAST_CACHE_TTL = 900.0
+    CACHE_MAX_ENTRIES = 256
+
+    def __init__(self, port: int = 8001):
         # Initialize base class
-        super().__init__("weather", port, tools)
-        
+        super().__init__("weather", port, _WEATHER_TOOLS)
+
+        # Tool dispatch table - avoids an if/elif chain per call
+        self._dispatch = {
+            "get_current_weather": self._get_current_weather,
+            "get_weather_forecast": self._get_weather_forecast,
+            "get_weather_alerts": self._get_weather_alerts,
+        }
+
         # Weather API configuration
         self.weather_api_key = os.getenv('OPENWEATHER_API_KEY')
         if not self.weather_api_key:
             self.logger.warning("⚠️ OPENWEATHER_API_KEY not set. Weather data will be simulated.")
+
+        # TTL-LRU caches keyed on the normalized request, so repeated
+        # questions about the same city skip the HTTPS round-trip
+        self._current_cache = OrderedDict()
+        self._forecast_cache = OrderedDict()
+
+        # Long-lived OpenWeatherMap client - keep-alive plus HTTP/2 so
+        # repeated calls reuse one TLS session instead of handshaking
+        # per request
+        self._owm = httpx.AsyncClient(
+            base_url="https://api.openweathermap.org/data/2.5",
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60.0)
+        )
+
+        @self.app.on_event("shutdown")
+        async def close_owm_client():
+            await self._owm.aclose()
+
+        # Private generator for simulated data - avoids the module-level
+        # Mersenne-Twister lock on every draw
+        self._rng = random.Random()
+
+        # Memoized location normalizations - the same city tends to come
+        # up repeatedly within a conversation
+        self._norm_cache = {}
+
+    def _cache_get(self, cache: OrderedDict, ttl: float, key: tuple):
+        """Return a fresh cached response, or None on miss/expiry"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        ts, value = entry
+        if time.monotonic() - ts >= ttl:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, cache: OrderedDict, key: tuple, value: str) -> str:
+        cache[key] = (time.monotonic(), value)
+        cache.move_to_end(key)
+        if len(cache) > self.CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        return value
     
     
     async def execute_tool(self, name: str, arguments: dict) -> str:
         """Execute tool logic"""
+        handler = self._dispatch.get(name)
+        if handler is None:
+            return f"❌ Unknown tool: {name}"
+
         try:
-            if name == "get_current_weather":
-                return await self._get_current_weather(
-                    arguments["location"],
-                    arguments.get("units", "imperial")
-                )
-            
-            elif name == "get_weather_forecast":
-                return await self._get_weather_forecast(
-                    arguments["location"],
-                    arguments.get("days", 3),
-                    arguments.get("units", "imperial")
-                )
-            
-            elif name == "get_weather_alerts":
-                return await self._get_weather_alerts(arguments["location"])
-            
-            else:
-                return f"❌ Unknown tool: {name}"
-                
+            return await handler(**arguments)
         except Exception as e:
             self.logger.error(f"❌ Tool error: {e}")
             return f"❌ Weather error: {str(e)}"
     
     def _normalize_location(self, location: str) -> str:
         """Normalize location format for OpenWeatherMap API"""
+        cached = self._norm_cache.get(location)
+        if cached is not None:
+            return cached
+
+        raw = location
         location = location.strip()
-        
+
         # Convert "City, ST" to "City,US" for US state abbreviations
         if ', ' in location:
             parts = location.split(', ')
             if len(parts) == 2 and len(parts[1]) <= 3 and parts[1].isupper():
-                return f"{parts[0]},US"
-        
+                location = f"{parts[0]},US"
+
+        if len(self._norm_cache) >= 512:
+            self._norm_cache.clear()
+        self._norm_cache[raw] = location
         return location
     
-    async def _get_current_weather(self, location: str, units: str = "imperial") -> str:
+    async def _get_current_weather(self, location: str, units: str = "imperial", **_ignored) -> str:
         """Get current weather for a location"""
         try:
             if self.weather_api_key:
                 # Normalize location format for OpenWeatherMap API
                 # Convert "City, ST" to "City,US" format
                 normalized_location = self._normalize_location(location)
-                
+
+                cache_key = (normalized_location, units)
+                cached = self._cache_get(self._current_cache, self.CURRENT_CACHE_TTL, cache_key)
+                if cached is not None:
+                    return cached
+
                 # Use real OpenWeatherMap API
-                async with httpx.AsyncClient() as client:
-                    url = f"https://api.openweathermap.org/data/2.5/weather"
-                    params = {
-                        "q": normalized_location,
-                        "appid": self.weather_api_key,
-                        "units": units
-                    }
-                    response = await client.get(url, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-                
+                params = {
+                    "q": normalized_location,
+                    "appid": self.weather_api_key,
+                    "units": units
+                }
+                response = await self._owm.get("/weather", params=params)
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+
                 # Format the response
                 temp_unit = "°F" if units == "imperial" else "°C" if units == "metric" else "K"
                 speed_unit = "mph" if units == "imperial" else "m/s"
@@ -165,8 +232,8 @@ class WeatherMCPServer(BaseMCPServer):
 🎯 **Pressure:** {data['main']['pressure']} hPa
 
 *Updated: {datetime.now().strftime('%I:%M %p')}*"""
-                
-                return weather_info
+
+                return self._cache_put(self._current_cache, cache_key, weather_info)
             
             else:
                 # Return simulated weather data
@@ -180,48 +247,63 @@ class WeatherMCPServer(BaseMCPServer):
         except Exception as e:
             return f"❌ Unable to get weather data: {str(e)}"
     
-    async def _get_weather_forecast(self, location: str, days: int = 3, units: str = "imperial") -> str:
+    async def _get_weather_forecast(self, location: str, days: int = 3, units: str = "imperial", **_ignored) -> str:
         """Get weather forecast for a location"""
         try:
             if self.weather_api_key:
                 # Normalize location format for OpenWeatherMap API
                 normalized_location = self._normalize_location(location)
-                
+
+                cache_key = (normalized_location, days, units)
+                cached = self._cache_get(self._forecast_cache, self.FORECAST_CACHE_TTL, cache_key)
+                if cached is not None:
+                    return cached
+
                 # Use real OpenWeatherMap API
-                async with httpx.AsyncClient() as client:
-                    url = f"https://api.openweathermap.org/data/2.5/forecast"
-                    params = {
-                        "q": normalized_location,
-                        "appid": self.weather_api_key,
-                        "units": units
-                    }
-                    response = await client.get(url, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-                
+                params = {
+                    "q": normalized_location,
+                    "appid": self.weather_api_key,
+                    "units": units
+                }
+                response = await self._owm.get("/forecast", params=params)
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+
                 # Format the forecast
                 temp_unit = "°F" if units == "imperial" else "°C" if units == "metric" else "K"
                 
-                forecast_info = f"📅 {days}-Day Weather Forecast for {data['city']['name']}, {data['city']['country']}\n\n"
+                # Built as a list and joined once - avoids quadratic
+                # string concatenation
+                parts = [f"📅 {days}-Day Weather Forecast for {data['city']['name']}, {data['city']['country']}\n\n"]
                 
-                # Group forecasts by day
-                daily_forecasts = {}
+                # Bucket by local calendar day in a single pass, tracking
+                # running min/max and a condition Counter - no strptime
+                # round trip and no re-walking each bucket per metric
+                daily = {}
                 for item in data['list'][:days * 8]:  # 8 forecasts per day (3-hour intervals)
-                    date = datetime.fromtimestamp(item['dt']).strftime('%Y-%m-%d')
-                    if date not in daily_forecasts:
-                        daily_forecasts[date] = []
-                    daily_forecasts[date].append(item)
-                
-                for date, forecasts in list(daily_forecasts.items())[:days]:
-                    day_name = datetime.strptime(date, '%Y-%m-%d').strftime('%A, %B %d')
-                    temps = [f['main']['temp'] for f in forecasts]
-                    conditions = [f['weather'][0]['description'] for f in forecasts]
-                    
-                    forecast_info += f"**{day_name}**\n"
-                    forecast_info += f"🌡️ High: {max(temps):.1f}{temp_unit} | Low: {min(temps):.1f}{temp_unit}\n"
-                    forecast_info += f"📊 Conditions: {max(set(conditions), key=conditions.count).title()}\n\n"
-                
-                return forecast_info
+                    day = datetime.fromtimestamp(item['dt']).date()
+                    bucket = daily.get(day)
+                    if bucket is None:
+                        bucket = daily[day] = {
+                            'tmin': float('inf'),
+                            'tmax': float('-inf'),
+                            'cond': Counter()
+                        }
+                    temp = item['main']['temp']
+                    if temp < bucket['tmin']:
+                        bucket['tmin'] = temp
+                    if temp > bucket['tmax']:
+                        bucket['tmax'] = temp
+                    bucket['cond'][item['weather'][0]['description']] += 1
+
+                for day, bucket in list(daily.items())[:days]:
+                    day_name = day.strftime('%A, %B %d')
+
+                    parts.append(f"**{day_name}**\n")
+                    parts.append(f"🌡️ High: {bucket['tmax']:.1f}{temp_unit} | Low: {bucket['tmin']:.1f}{temp_unit}\n")
+                    parts.append(f"📊 Conditions: {bucket['cond'].most_common(1)[0][0].title()}\n\n")
+
+                return self._cache_put(self._forecast_cache, cache_key, "".join(parts))
             
             else:
                 # Return simulated forecast
@@ -230,7 +312,7 @@ class WeatherMCPServer(BaseMCPServer):
         except Exception as e:
             return f"❌ Unable to get forecast data: {str(e)}"
     
-    async def _get_weather_alerts(self, location: str) -> str:
+    async def _get_weather_alerts(self, location: str, **_ignored) -> str:
         """Get weather alerts for a location"""
         # For demo purposes, return simulated alerts
         # In production, you'd use a weather alerts API
@@ -238,55 +320,54 @@ class WeatherMCPServer(BaseMCPServer):
     
     async def _get_simulated_weather(self, location: str, units: str) -> str:
         """Generate simulated weather data for demo purposes"""
-        import random
-        
         temp_ranges = {
             "imperial": (45, 85, "°F"),
             "metric": (7, 29, "°C"),
             "kelvin": (280, 302, "K")
         }
-        
+
         temp_min, temp_max, temp_unit = temp_ranges[units]
-        temp = random.randint(temp_min, temp_max)
-        
-        conditions = ["Clear", "Partly Cloudy", "Cloudy", "Light Rain", "Sunny"]
-        condition = random.choice(conditions)
-        
+        rng = self._rng
+        temp = rng.randint(temp_min, temp_max)
+        feels_like = temp + rng.randint(-3, 3)
+        humidity = rng.randint(30, 80)
+        wind = rng.randint(3, 15)
+        condition = rng.choice(_SIM_CONDITIONS)
+
         return f"""🌤️ Current Weather for {location} (Simulated)
 
 📊 **Conditions:** {condition}
 🌡️ **Temperature:** {temp}{temp_unit}
-🔥 **Feels Like:** {temp + random.randint(-3, 3)}{temp_unit}
-💧 **Humidity:** {random.randint(30, 80)}%
-💨 **Wind:** {random.randint(3, 15)} {"mph" if units == "imperial" else "m/s"}
+🔥 **Feels Like:** {feels_like}{temp_unit}
+💧 **Humidity:** {humidity}%
+💨 **Wind:** {wind} {"mph" if units == "imperial" else "m/s"}
 
 ⚠️ *Demo data - Set OPENWEATHER_API_KEY for real weather*
 *Updated: {datetime.now().strftime('%I:%M %p')}*"""
     
     async def _get_simulated_forecast(self, location: str, days: int, units: str) -> str:
         """Generate simulated forecast data"""
-        import random
-        
+        rng = self._rng
         temp_unit = "°F" if units == "imperial" else "°C" if units == "metric" else "K"
         
-        forecast_info = f"📅 {days}-Day Weather Forecast for {location} (Simulated)\n\n"
-        
+        # Built as a list and joined once - avoids quadratic string
+        # concatenation
+        parts = [f"📅 {days}-Day Weather Forecast for {location} (Simulated)\n\n"]
+
         for i in range(days):
             date = datetime.now() + timedelta(days=i)
             day_name = date.strftime('%A, %B %d')
-            
-            high = random.randint(70, 85) if units == "imperial" else random.randint(20, 30)
-            low = high - random.randint(10, 20)
-            
-            conditions = ["Sunny", "Partly Cloudy", "Cloudy", "Light Rain", "Clear"]
-            condition = random.choice(conditions)
-            
-            forecast_info += f"**{day_name}**\n"
-            forecast_info += f"🌡️ High: {high}{temp_unit} | Low: {low}{temp_unit}\n"
-            forecast_info += f"📊 Conditions: {condition}\n\n"
-        
-        forecast_info += "⚠️ *Demo data - Set OPENWEATHER_API_KEY for real weather*"
-        return forecast_info
+
+            high = rng.randint(70, 85) if units == "imperial" else rng.randint(20, 30)
+            low = high - rng.randint(10, 20)
+            condition = rng.choice(_SIM_FORECAST_CONDITIONS)
+
+            parts.append(f"**{day_name}**\n")
+            parts.append(f"🌡️ High: {high}{temp_unit} | Low: {low}{temp_unit}\n")
+            parts.append(f"📊 Conditions: {condition}\n\n")
+
+        parts.append("⚠️ *Demo data - Set OPENWEATHER_API_KEY for real weather*")
+        return "".join(parts)
     
     def start_server(self):
         """Start the Weather MCP server"""